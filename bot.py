@@ -8,6 +8,7 @@ from datetime import timedelta
 import asyncio
 import os
 from dotenv import load_dotenv
+from history import ParticipationHistory, parse_offender_spec
 
 # Load environment variables
 load_dotenv()
@@ -19,6 +20,9 @@ EXCLUDED_USER_IDS = {int(id) for id in os.getenv('EXCLUDED_USER_IDS', '').split(
 # Your bot token from environment variable
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 
+# Where participation history is kept between sessions and restarts
+HISTORY_FILE = os.getenv('HISTORY_FILE', 'history.dat')
+
 # Global Variables
 session_active = False
 user_messages = defaultdict(list)  # Tracks usernames and messages per user
@@ -29,6 +33,7 @@ muted_users = {}  # Tracks muted users {user_id: chat_id}
 link_usernames = defaultdict(int)  # Tracks unique usernames and link counts globally
 checked_users = set()  # Tracks users who sent text messages before /check
 post_check_users = set()  # Tracks users who send messages after /check
+history = ParticipationHistory.load(HISTORY_FILE)  # Done/unsafe flags of past sessions
 
 # Function to extract usernames from URLs
 def extract_usernames(text):
@@ -57,6 +62,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     total_unique_links = 0
     muted_users.clear()
     banned_users.clear()
+    checked_users.clear()
+    post_check_users.clear()
     await update.message.reply_text("🚨 SESSION STARTED 🚨\n📢 Drop your links ❤️")
 
 # List Links Command
@@ -214,10 +221,60 @@ async def unsafe_list(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     for i in range(0, len(response), chunk_size):
         await update.message.reply_text(response[i:i + chunk_size])
 
+# Repeat Offenders Command
+async def offenders(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not is_authorized(update.effective_user.id):
+        return
+
+    spec = parse_offender_spec(context.args[0]) if context.args else None
+    if spec is None:
+        await update.message.reply_text("Usage: /offenders <unsafe/sessions> (e.g., /offenders 3/5)")
+        return
+
+    min_unsafe, last = spec
+    offender_ids = history.repeat_offenders(min_unsafe, last) - EXCLUDED_USER_IDS
+    if not offender_ids:
+        await update.message.reply_text(f"No users were unsafe in {min_unsafe} of the last {last} sessions.")
+        return
+
+    response_lines = [f"Unsafe in {min_unsafe} of the last {last} sessions:"]
+    for i, user_id in enumerate(sorted(offender_ids), start=1):
+        joined, done, unsafe = history.user_summary(user_id, last)
+        response_lines.append(f"{i}) {user_id} (unsafe {unsafe}, done {done}, joined {joined})")
+
+    for chunk in split_message("\n".join(response_lines)):
+        await update.message.reply_text(chunk)
+
+# No Proof Command
+async def noproof(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if not is_authorized(update.effective_user.id):
+        return
+    if context.args and not context.args[0].isdigit():
+        await update.message.reply_text("Usage: /noproof [sessions] (e.g., /noproof 10)")
+        return
+
+    last = int(context.args[0]) if context.args else None
+    user_ids = history.never_done(last) - EXCLUDED_USER_IDS
+    scope = f"the last {last} sessions" if last else "all recorded sessions"
+    if not user_ids:
+        await update.message.reply_text(f"Everyone submitted proof at least once in {scope}.")
+        return
+
+    response = f"Never submitted proof in {scope}:\n" + "\n".join(f"{i}) {user_id}" for i, user_id in enumerate(sorted(user_ids), start=1))
+    for chunk in split_message(response):
+        await update.message.reply_text(chunk)
+
 # Ban User Command
 async def ban(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not is_authorized(update.effective_user.id):
         return
+
+    # /ban 3/5 bans everyone unsafe in 3 of the last 5 sessions
+    spec = parse_offender_spec(context.args[0]) if context.args and "/" in context.args[0] else None
+    if spec:
+        await ban_repeat_offenders(update, context, *spec)
+        return
+
     if not is_valid_user_id(context, context.args):
         await update.message.reply_text("Please provide a valid user ID to ban.")
         return
@@ -230,6 +287,24 @@ async def ban(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     except Exception as e:
         await update.message.reply_text(f"Failed to ban user {user_id}: {e}")
 
+# Ban Repeat Offenders
+async def ban_repeat_offenders(update: Update, context: ContextTypes.DEFAULT_TYPE, min_unsafe: int, last: int) -> None:
+    offenders = history.repeat_offenders(min_unsafe, last) - EXCLUDED_USER_IDS
+    if not offenders:
+        await update.message.reply_text(f"No users were unsafe in {min_unsafe} of the last {last} sessions.")
+        return
+
+    banned_count = 0
+    for user_id in offenders:
+        try:
+            await context.bot.ban_chat_member(chat_id=update.effective_chat.id, user_id=user_id)
+            banned_users.add(user_id)
+            banned_count += 1
+        except Exception as e:
+            await update.message.reply_text(f"Failed to ban user {user_id}: {e}")
+
+    await update.message.reply_text(f"Banned {banned_count} users who were unsafe in {min_unsafe} of the last {last} sessions.")
+
 # Unban User Command
 async def unban(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     if not is_authorized(update.effective_user.id):
@@ -253,7 +328,7 @@ async def muteall(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         return
 
     if len(context.args) < 1:
-        await update.message.reply_text("Usage: /muteall <duration> (e.g., /muteall 7h or /muteall 7d)")
+        await update.message.reply_text("Usage: /muteall <duration> [unsafe/sessions] (e.g., /muteall 7h or /muteall 7d 3/5)")
         return
 
     duration_str = context.args[0]
@@ -263,7 +338,15 @@ async def muteall(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         await update.message.reply_text("Invalid duration format. Use (e.g., 30m, 2h, 1d).")
         return
 
-    unsafe_users = checked_users - post_check_users
+    if len(context.args) > 1:
+        # Mute repeat offenders from history instead of the current unsafe list
+        spec = parse_offender_spec(context.args[1])
+        if spec is None:
+            await update.message.reply_text("Invalid history format. Use unsafe/sessions (e.g., 3/5).")
+            return
+        unsafe_users = history.repeat_offenders(*spec)
+    else:
+        unsafe_users = checked_users - post_check_users
     unsafe_users -= EXCLUDED_USER_IDS  # Exclude certain users
 
     if not unsafe_users:
@@ -509,11 +592,21 @@ async def end(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         return
 
     session_active = False
+
+    # Keep the session's flags before everything is wiped
+    history.record_session(
+        participants=set(user_messages.keys()) - EXCLUDED_USER_IDS,
+        checked=checked_users - EXCLUDED_USER_IDS,
+        done=post_check_users,
+    )
+
     user_messages.clear()
     link_count.clear()
     total_unique_links = 0
     banned_users.clear()
     muted_users.clear()
+    checked_users.clear()
+    post_check_users.clear()
 
     await update.message.reply_text("Session is ended. Use /start to begin a new session.")
 
@@ -634,11 +727,8 @@ def split_message(text, chunk_size=4000):
     for i in range(0, len(text), chunk_size):
         yield text[i:i + chunk_size]
 
-# Main Function
-def main():
-    application = ApplicationBuilder().token(BOT_TOKEN).build()
-
-    # Handlers
+# Register Command and Message Handlers
+def add_handlers(application):
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("list", list_messages))
     application.add_handler(CommandHandler("total", total))
@@ -646,6 +736,8 @@ def main():
     application.add_handler(CommandHandler("check", check))
     application.add_handler(CommandHandler("muteall", muteall))
     application.add_handler(CommandHandler("unsafelist", unsafe_list))
+    application.add_handler(CommandHandler("offenders", offenders))
+    application.add_handler(CommandHandler("noproof", noproof))
     application.add_handler(CommandHandler("end", end))
     application.add_handler(CommandHandler("ban", ban))
     application.add_handler(CommandHandler("unban", unban))
@@ -662,6 +754,11 @@ def main():
     application.add_handler(CommandHandler("replyunban", reply_unban))
     application.add_handler(MessageHandler(filters.TEXT | filters.PHOTO | filters.VIDEO | filters.Document.ALL, record_message))
 
+# Main Function
+def main():
+    application = ApplicationBuilder().token(BOT_TOKEN).build()
+    add_handlers(application)
+
     # Add error handling for production
     try:
         print("Bot is starting...")
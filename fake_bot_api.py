@@ -0,0 +1,213 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl
+from collections import Counter, deque
+import itertools
+import json
+import random
+import threading
+import time
+
+# Methods that get artificial latency and random 429 responses
+THROTTLED_METHODS = {"getChat", "restrictChatMember", "sendMessage"}
+
+BOT_USER = {
+    "id": 1,
+    "is_bot": True,
+    "first_name": "Soak Bot",
+    "username": "soak_bot",
+    "can_join_groups": True,
+    "can_read_all_group_messages": True,
+    "supports_inline_queries": False,
+}
+
+# Decode a form field the way python-telegram-bot encodes it (JSON for non-strings)
+def decode_param(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+# Local stand-in for the Telegram Bot API
+class FakeBotAPI:
+    def __init__(self, host="127.0.0.1", port=0, latency=(0.05, 0.3), rate_limit=0.02, retry_after=1, seed=None, call_log=None):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.call_log = call_log  # Optional file object, every API call is written as a JSON line
+        self.call_counts = Counter()
+        self.throttled_counts = Counter()
+        self.command_latencies = []  # (command, seconds) from delivery to first reply
+        self._lock = threading.Lock()
+        self._updates_ready = threading.Condition(self._lock)
+        self._pending_updates = deque()
+        self._update_ids = itertools.count(1)
+        self._incoming_message_ids = itertools.count(1)
+        self._outgoing_message_ids = itertools.count(1_000_000_000)
+        self._delivered = {}  # {message_id: (command, delivery time)} awaiting a reply
+        self._closed = False
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._closed = True
+            self._updates_ready.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    # Scripted Traffic
+    def push_message(self, chat_id, user, text=None, photo=False):
+        message_id = next(self._incoming_message_ids)
+        message = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "supergroup", "title": "Soak Group"},
+            "from": {"id": user["id"], "is_bot": False, "first_name": user["first_name"], "username": user["username"]},
+        }
+        if text is not None:
+            message["text"] = text
+            if text.startswith("/"):
+                command = text.split()[0]
+                message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(command)}]
+        if photo:
+            message["photo"] = [{
+                "file_id": f"proof-{message_id}",
+                "file_unique_id": f"proof-{message_id}",
+                "width": 720,
+                "height": 1280,
+            }]
+
+        with self._lock:
+            self._pending_updates.append({"update_id": next(self._update_ids), "message": message})
+            self._updates_ready.notify_all()
+        return message_id
+
+    def pending_commands(self):
+        with self._lock:
+            return len(self._delivered)
+
+    # getUpdates long polling
+    def _get_updates(self, params):
+        offset = params.get("offset", 0)
+        limit = params.get("limit", 100)
+        timeout = params.get("timeout", 0)
+        deadline = time.monotonic() + timeout
+
+        with self._lock:
+            while self._pending_updates and self._pending_updates[0]["update_id"] < offset:
+                self._pending_updates.popleft()
+
+            while not self._pending_updates and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._updates_ready.wait(remaining)
+
+            updates = list(itertools.islice(self._pending_updates, limit))
+            now = time.monotonic()
+            for update in updates:
+                message = update["message"]
+                if "entities" in message and message["message_id"] not in self._delivered:
+                    self._delivered[message["message_id"]] = (message["text"].split()[0], now)
+            return updates
+
+    def _send_message(self, params):
+        reply_to = params.get("reply_to_message_id")
+        if reply_to is None and isinstance(params.get("reply_parameters"), dict):
+            reply_to = params["reply_parameters"].get("message_id")
+
+        with self._lock:
+            delivered = self._delivered.pop(reply_to, None)
+            if delivered:
+                command, delivered_at = delivered
+                self.command_latencies.append((command, time.monotonic() - delivered_at))
+
+        return {
+            "message_id": next(self._outgoing_message_ids),
+            "date": int(time.time()),
+            "chat": {"id": params.get("chat_id"), "type": "supergroup", "title": "Soak Group"},
+            "from": BOT_USER,
+            "text": str(params.get("text", "")),
+        }
+
+    def _get_chat(self, params):
+        chat_id = params.get("chat_id")
+        return {"id": chat_id, "type": "private", "username": f"user{chat_id}", "first_name": f"User {chat_id}"}
+
+    def handle(self, method, params):
+        """Returns (status, body) for a single Bot API call."""
+        status = 200
+        if method in THROTTLED_METHODS:
+            time.sleep(self.random.uniform(*self.latency))
+            if self.random.random() < self.rate_limit:
+                status = 429
+
+        with self._lock:
+            self.call_counts[method] += 1
+            if status == 429:
+                self.throttled_counts[method] += 1
+            if self.call_log:
+                self.call_log.write(json.dumps({"time": time.time(), "method": method, "params": params, "status": status}) + "\n")
+
+        if status == 429:
+            return status, {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }
+
+        if method == "getMe":
+            result = BOT_USER
+        elif method == "getUpdates":
+            result = self._get_updates(params)
+        elif method == "sendMessage":
+            result = self._send_message(params)
+        elif method == "getChat":
+            result = self._get_chat(params)
+        else:
+            result = True  # restrictChatMember, banChatMember, deleteWebhook, ...
+        return status, {"ok": True, "result": result}
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    params = json.loads(body or "{}")
+                else:
+                    params = {key: decode_param(value) for key, value in parse_qsl(body)}
+
+                method = self.path.rstrip("/").rsplit("/", 1)[-1]
+                status, payload = api.handle(method, params)
+
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                try:
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The bot dropped a long poll while shutting down
+
+            do_GET = do_POST
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,178 @@
+from array import array
+import os
+import struct
+import time
+
+MAGIC = b"PHS1"
+
+# Iterate the indexes of the set bits in a bitset
+def iter_bits(bits):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+# Bitset of users flagged in at least `threshold` of the given bitsets
+def at_least(bitsets, threshold, universe):
+    # Bit-sliced counter: planes[i] holds bit i of every user's count
+    planes = []
+    for bits in bitsets:
+        carry = bits
+        for i in range(len(planes)):
+            if not carry:
+                break
+            planes[i], carry = planes[i] ^ carry, planes[i] & carry
+        if carry:
+            planes.append(carry)
+
+    if threshold <= 0:
+        return universe
+    if threshold.bit_length() > len(planes):
+        return 0
+
+    greater, equal = 0, universe
+    for i in reversed(range(len(planes))):
+        if threshold >> i & 1:
+            equal &= planes[i]
+        else:
+            greater |= equal & planes[i]
+            equal &= ~planes[i]
+    return (greater | equal) & universe
+
+# One ended session, flags are bitsets over ParticipationHistory user indexes
+class SessionRecord:
+    __slots__ = ("ended", "participants", "done", "unsafe")
+
+    def __init__(self, ended, participants, done, unsafe):
+        self.ended = ended
+        self.participants = participants  # Posted links or were tracked by /check
+        self.done = done  # Sent a message or proof after /check
+        self.unsafe = unsafe  # Tracked by /check but never done
+
+# Compact participation history across sessions
+class ParticipationHistory:
+    def __init__(self, path=None):
+        self.path = path
+        self.user_ids = array("q")  # Index -> Telegram user ID
+        self.index = {}  # Telegram user ID -> index
+        self.sessions = []
+
+    @classmethod
+    def load(cls, path):
+        history = cls(path)
+        if not path or not os.path.exists(path):
+            return history
+
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a participation history file")
+
+        pos = 4
+        (user_count,) = struct.unpack_from("<Q", data, pos)
+        pos += 8
+        history.user_ids.frombytes(data[pos:pos + user_count * 8])
+        pos += user_count * 8
+        history.index = {user_id: i for i, user_id in enumerate(history.user_ids)}
+
+        (session_count,) = struct.unpack_from("<Q", data, pos)
+        pos += 8
+        for _ in range(session_count):
+            (ended,) = struct.unpack_from("<d", data, pos)
+            pos += 8
+            flags = []
+            for _ in range(3):
+                (size,) = struct.unpack_from("<I", data, pos)
+                pos += 4
+                flags.append(int.from_bytes(data[pos:pos + size], "little"))
+                pos += size
+            history.sessions.append(SessionRecord(ended, *flags))
+        return history
+
+    def save(self):
+        if not self.path:
+            return
+
+        parts = [MAGIC, struct.pack("<Q", len(self.user_ids)), self.user_ids.tobytes(), struct.pack("<Q", len(self.sessions))]
+        for session in self.sessions:
+            parts.append(struct.pack("<d", session.ended))
+            for bits in (session.participants, session.done, session.unsafe):
+                raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+                parts.append(struct.pack("<I", len(raw)))
+                parts.append(raw)
+
+        # Write to a temporary file first so a crash never leaves a truncated history
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(parts))
+        os.replace(tmp_path, self.path)
+
+    def _bits_for(self, user_ids):
+        bits = 0
+        for user_id in user_ids:
+            i = self.index.get(user_id)
+            if i is None:
+                i = len(self.user_ids)
+                self.index[user_id] = i
+                self.user_ids.append(user_id)
+            bits |= 1 << i
+        return bits
+
+    def _user_ids_for(self, bits):
+        return {self.user_ids[i] for i in iter_bits(bits)}
+
+    def _universe(self):
+        return (1 << len(self.user_ids)) - 1
+
+    def _recent(self, last):
+        return self.sessions[-last:] if last else self.sessions
+
+    def record_session(self, participants, checked, done, ended=None):
+        """Stores one ended session and saves the history file."""
+        participants = set(participants) | set(checked)
+        done = set(done) & set(checked)
+        record = SessionRecord(
+            time.time() if ended is None else ended,
+            self._bits_for(participants),
+            self._bits_for(done),
+            self._bits_for(set(checked) - done),
+        )
+        self.sessions.append(record)
+        self.save()
+        return record
+
+    # Queries
+    def repeat_offenders(self, min_unsafe, last=None):
+        """User IDs that were unsafe in at least `min_unsafe` of the last `last` sessions."""
+        bitsets = [session.unsafe for session in self._recent(last)]
+        return self._user_ids_for(at_least(bitsets, min_unsafe, self._universe()))
+
+    def never_done(self, last=None):
+        """User IDs flagged unsafe at least once and never done in the last `last` sessions."""
+        unsafe = done = 0
+        for session in self._recent(last):
+            unsafe |= session.unsafe
+            done |= session.done
+        return self._user_ids_for(unsafe & ~done)
+
+    def user_summary(self, user_id, last=None):
+        """Returns (sessions joined, times done, times unsafe) for one user."""
+        i = self.index.get(user_id)
+        if i is None:
+            return 0, 0, 0
+        joined = done = unsafe = 0
+        for session in self._recent(last):
+            joined += session.participants >> i & 1
+            done += session.done >> i & 1
+            unsafe += session.unsafe >> i & 1
+        return joined, done, unsafe
+
+# Parse a repeat offender spec like "3/5" (unsafe in 3 of the last 5 sessions)
+def parse_offender_spec(spec):
+    try:
+        min_unsafe, last = (int(part) for part in spec.split("/"))
+    except ValueError:
+        return None
+    if min_unsafe < 1 or last < min_unsafe:
+        return None
+    return min_unsafe, last
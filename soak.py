@@ -0,0 +1,175 @@
+from telegram import Update
+from telegram.ext import ApplicationBuilder
+from collections import defaultdict
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+
+import bot
+from fake_bot_api import FakeBotAPI
+from history import ParticipationHistory
+
+# Soak Test Settings
+ADMIN_ID = 999000001
+GROUP_CHAT_ID = -1001234567890
+SOAK_TOKEN = "123456:SOAK-TEST-TOKEN"
+
+# Slot timetable, mirrors the /slot command
+SLOTS = [
+    ("First", "07:00", "09:30"),
+    ("Second", "10:00", "12:30"),
+    ("Third", "13:00", "15:30"),
+    ("Fourth", "16:00", "18:30"),
+    ("Fifth", "19:00", "21:30"),
+]
+
+ADMIN = {"id": ADMIN_ID, "first_name": "Admin", "username": "soak_admin"}
+
+# Build the scripted traffic for one slot as (simulated seconds from slot start, user, text, photo)
+def slot_script(users, length, rng, double_rate, proof_rate):
+    events = [(0, ADMIN, "/start", False)]
+    link_window = length * 0.4
+    check_at = length * 0.45
+    unsafe_at = length * 0.93
+
+    for user in users:
+        posts = 2 if rng.random() < double_rate else 1
+        for _ in range(posts):
+            text = f"https://x.com/{user['username']}/status/{rng.randrange(10**18, 10**19)}"
+            events.append((rng.uniform(1, link_window), user, text, False))
+
+    events.append((link_window + 1, ADMIN, "/total", False))
+    events.append((link_window + 2, ADMIN, "/doublelinks", False))
+    events.append((link_window + 3, ADMIN, "/list", False))
+    events.append((check_at, ADMIN, "/check", False))
+
+    for user in users:
+        if rng.random() < proof_rate:
+            events.append((rng.uniform(check_at + 1, unsafe_at - 1), user, None, True))
+
+    events.append((unsafe_at, ADMIN, "/unsafelist", False))
+    events.append((unsafe_at + 1, ADMIN, "/muteall 1m", False))
+    events.append((length, ADMIN, "/end", False))
+    events.append((length + 1, ADMIN, "/offenders 3/5", False))
+    return sorted(events, key=lambda event: event[0])
+
+# Bot memory in bytes, excluding the soak harness itself
+def bot_memory():
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, "*fake_bot_api.py"),
+        tracemalloc.Filter(False, "*soak.py"),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def print_report(label, api, baseline, memory):
+    print(f"\n== {label} ==")
+    print(f"Bot memory: {memory / 1024:.1f} KiB ({(memory - baseline) / 1024:+.1f} KiB since start)")
+    print(f"Tracked state: user_messages={len(bot.user_messages)} link_count={len(bot.link_count)} "
+          f"link_usernames={len(bot.link_usernames)} muted_users={len(bot.muted_users)} banned_users={len(bot.banned_users)} "
+          f"history_sessions={len(bot.history.sessions)}")
+    print("API calls: " + ", ".join(f"{method}={count}" for method, count in sorted(api.call_counts.items())))
+    if api.throttled_counts:
+        print("429 responses: " + ", ".join(f"{method}={count}" for method, count in sorted(api.throttled_counts.items())))
+
+    by_command = defaultdict(list)
+    for command, seconds in api.command_latencies:
+        by_command[command].append(seconds)
+    for command, values in sorted(by_command.items()):
+        print(f"  {command:<13} n={len(values):<4} p50={statistics.median(values):.3f}s "
+              f"p95={percentile(values, 0.95):.3f}s max={max(values):.3f}s")
+    if api.pending_commands():
+        print(f"Commands without a reply: {api.pending_commands()}")
+
+async def run_soak(args):
+    rng = random.Random(args.seed)
+    call_log = open(args.call_log, "w") if args.call_log else None
+    api = FakeBotAPI(latency=(args.min_latency, args.max_latency), rate_limit=args.rate_limit,
+                     retry_after=args.retry_after, seed=args.seed, call_log=call_log)
+    api.start()
+
+    # Point the bot at the fake server with a known admin
+    bot.AUTHORIZED_IDS = [ADMIN_ID]
+    bot.EXCLUDED_USER_IDS = set()
+    bot.history = ParticipationHistory()  # Keep soak sessions out of the real history file
+    application = ApplicationBuilder().token(SOAK_TOKEN).base_url(api.base_url).build()
+    bot.add_handlers(application)
+
+    users = [{"id": 500000000 + i, "first_name": f"User {i}", "username": f"tweeter{i}"} for i in range(args.users)]
+    day_start = datetime.strptime(SLOTS[0][1], "%H:%M")
+
+    tracemalloc.start()
+    started = time.monotonic()
+    try:
+        async with application:
+            await application.updater.start_polling(poll_interval=0, timeout=10, allowed_updates=Update.ALL_TYPES)
+            await application.start()
+            baseline = bot_memory()
+
+            for day in range(1, args.days + 1):
+                for name, opens, closes in SLOTS:
+                    slot_open = datetime.strptime(opens, "%H:%M")
+                    length = (datetime.strptime(closes, "%H:%M") - slot_open).total_seconds()
+                    # Slots are laid out on one simulated clock, compressed by --speed
+                    offset = (day - 1) * 86400 / args.speed + (slot_open - day_start).total_seconds() / args.speed
+                    slot_started = started + offset
+
+                    for at, user, text, photo in slot_script(users, length, rng, args.double_rate, args.proof_rate):
+                        delay = slot_started + at / args.speed - time.monotonic()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        api.push_message(GROUP_CHAT_ID, user, text=text, photo=photo)
+
+                    # Give the last command time to be answered before sampling
+                    await asyncio.sleep(args.settle)
+                    print_report(f"Day {day}, {name} Slot ({opens} - {closes})", api, baseline, bot_memory())
+
+                # Skip the simulated night unless another day follows
+                if day < args.days:
+                    next_day = started + day * 86400 / args.speed
+                    await asyncio.sleep(max(0, next_day - time.monotonic()))
+
+            await application.updater.stop()
+            await application.stop()
+
+            # Drop unmute timers still sleeping from the last /muteall
+            for task in asyncio.all_tasks():
+                if task.get_coro().__qualname__ == "unmute_after_delay":
+                    task.cancel()
+    finally:
+        api.stop()
+        if call_log:
+            call_log.close()
+
+    elapsed = timedelta(seconds=int(time.monotonic() - started))
+    print_report(f"Soak finished after {elapsed} ({args.days} day(s) at {args.speed}x)", api, baseline, bot_memory())
+    tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot against a local fake Bot API through full days of slots.")
+    parser.add_argument("--days", type=int, default=1, help="Simulated days of five slots")
+    parser.add_argument("--speed", type=float, default=60, help="Simulated seconds per real second")
+    parser.add_argument("--users", type=int, default=200, help="Participants per slot")
+    parser.add_argument("--double-rate", type=float, default=0.1, help="Share of users posting two links")
+    parser.add_argument("--proof-rate", type=float, default=0.8, help="Share of users sending proof after /check")
+    parser.add_argument("--min-latency", type=float, default=0.05, help="Minimum API latency in seconds")
+    parser.add_argument("--max-latency", type=float, default=0.3, help="Maximum API latency in seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.02, help="Chance of a 429 on throttled methods")
+    parser.add_argument("--retry-after", type=int, default=1, help="retry_after sent with 429 responses")
+    parser.add_argument("--settle", type=float, default=5, help="Seconds to wait before each slot report")
+    parser.add_argument("--call-log", help="Write every API call to this JSON lines file")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible traffic")
+    asyncio.run(run_soak(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()